@@ -0,0 +1,98 @@
+"""Benchmark login latency: legacy email query vs. direct document read.
+
+Runs against an in-memory stand-in for Firestore, so no credentials or
+network are needed. The Firestore latencies are ASSUMED inputs, not
+measurements: each query sleeps BENCH_QUERY_LATENCY and each point read
+sleeps BENCH_POINT_READ_LATENCY, so the gap between the two paths mostly
+reflects those settings. What the benchmark does measure is the rest of
+the request (validation, bcrypt, token creation) and how many round trips
+each path makes. The "unknown email" rows enable the negative cache, so
+the direct path there is a cache hit.
+
+    python -m benchmarks.bench_login
+"""
+import os
+import sys
+import time
+import types
+from statistics import mean, median
+from benchmarks.fake_firestore import FakeClient
+
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+# Simulated round trips (seconds). Indexed queries cost more than point reads.
+POINT_READ_LATENCY = float(os.getenv("BENCH_POINT_READ_LATENCY", 0.004))
+QUERY_LATENCY = float(os.getenv("BENCH_QUERY_LATENCY", 0.009))
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", 200))
+
+db = FakeClient(point_read_latency=POINT_READ_LATENCY, query_latency=QUERY_LATENCY)
+sys.modules["database"] = types.SimpleNamespace(db=db)
+
+from fastapi import HTTPException  # noqa: E402
+from auth import pwd_context, verify_password  # noqa: E402
+from cachetools import TTLCache  # noqa: E402
+from routes import users  # noqa: E402
+
+# The negative cache is off by default; turn it on to show its effect
+users._unknown_emails = TTLCache(maxsize=users.UNKNOWN_EMAIL_CACHE_SIZE, ttl=30)
+
+
+# 🕰️ Previous login implementation (collection query on "email")
+def legacy_login(username, password):
+    user_doc = None
+    for doc in db.collection("users").where("email", "==", username).stream():
+        user_doc = doc.to_dict()
+        break
+    if not user_doc or not verify_password(password, user_doc["password"]):
+        raise HTTPException(status_code=400, detail="Invalid email or password")
+    return user_doc
+
+
+def new_login(username, password):
+    form = types.SimpleNamespace(username=username, password=password)
+    return users.login_user(form)
+
+
+def measure(fn, username, password):
+    samples = []
+    db.reads = 0
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        try:
+            fn(username, password)
+        except HTTPException:
+            pass
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, db.reads / ITERATIONS
+
+
+def report(label, result):
+    samples, reads = result
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<36} mean {mean(samples):7.2f} ms   p50 {median(samples):7.2f} ms   "
+          f"p95 {p95:7.2f} ms   reads/login {reads:.2f}")
+
+
+def main():
+    password = "correct horse"
+    # Low bcrypt cost keeps hashing from drowning out the lookup difference
+    hashed = pwd_context.copy(bcrypt__rounds=4).hash(password)
+    for i in range(1000):
+        email = f"user{i}@example.com"
+        db.collection("users").document(email).set({"email": email, "password": hashed})
+
+    known = "user500@example.com"
+    unknown = "nobody@example.com"
+
+    print(f"{ITERATIONS} iterations; latencies are assumed, not measured: "
+          f"point read {POINT_READ_LATENCY * 1000:.1f} ms, query {QUERY_LATENCY * 1000:.1f} ms\n")
+    report("legacy  / known email", measure(legacy_login, known, password))
+    report("direct  / known email", measure(new_login, known, password))
+    report("legacy  / unknown email", measure(legacy_login, unknown, password))
+    report("direct  / unknown email (cached)", measure(new_login, unknown, password))
+
+
+if __name__ == "__main__":
+    main()
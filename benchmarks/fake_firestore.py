@@ -0,0 +1,80 @@
+"""In-memory stand-in for the slice of the Firestore client the user routes use.
+
+Each read can sleep for a configured latency to mimic a network round trip.
+"""
+import time
+from google.api_core.exceptions import AlreadyExists
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocument:
+    def __init__(self, client, store, doc_id):
+        if not doc_id or "/" in doc_id:
+            raise ValueError("A document must have an even number of path elements")
+        self._client = client
+        self._store = store
+        self._id = doc_id
+
+    def get(self):
+        self._client.reads += 1
+        time.sleep(self._client.point_read_latency)
+        return FakeSnapshot(self._id, self._store.get(self._id))
+
+    def set(self, data):
+        self._store[self._id] = dict(data)
+
+    def create(self, data):
+        if self._id in self._store:
+            raise AlreadyExists(f"Document already exists: {self._id}")
+        self._store[self._id] = dict(data)
+
+
+class FakeQuery:
+    def __init__(self, client, store, field, value):
+        self._client = client
+        self._store = store
+        self._field = field
+        self._value = value
+
+    def stream(self):
+        self._client.reads += 1
+        time.sleep(self._client.query_latency)
+        for doc_id, data in self._store.items():
+            if data.get(self._field) == self._value:
+                yield FakeSnapshot(doc_id, data)
+
+
+class FakeCollection:
+    def __init__(self, client, store):
+        self._client = client
+        self._store = store
+
+    def document(self, doc_id):
+        return FakeDocument(self._client, self._store, doc_id)
+
+    def where(self, field, op, value):
+        return FakeQuery(self._client, self._store, field, value)
+
+
+class FakeClient:
+    def __init__(self, point_read_latency=0.0, query_latency=0.0):
+        self.point_read_latency = point_read_latency
+        self.query_latency = query_latency
+        self.reads = 0
+        self._collections = {}
+
+    def collection(self, name):
+        return FakeCollection(self, self._collections.setdefault(name, {}))
+
+    def reset(self):
+        self.reads = 0
+        self._collections.clear()
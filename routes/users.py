@@ -5,16 +5,79 @@ from auth import hash_password, verify_password, create_access_token, get_curren
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta, datetime
 from uuid import uuid4
-from google.cloud.firestore import FieldFilter
+from threading import Lock
+from cachetools import TTLCache
+from email_validator import validate_email, EmailNotValidError
+from google.api_core.exceptions import AlreadyExists, InvalidArgument
+import os
 
 router = APIRouter()
 
+# 🚫 Negative cache for unknown login emails (absorbs credential-stuffing bursts)
+# Off by default: the cache is per process, so with several gunicorn workers a
+# freshly registered user can be refused by another worker for up to the TTL.
+# Only enable it (with a small TTL, e.g. 5) when that delay is acceptable.
+UNKNOWN_EMAIL_CACHE_TTL = int(os.getenv("UNKNOWN_EMAIL_CACHE_TTL", 0))
+UNKNOWN_EMAIL_CACHE_SIZE = int(os.getenv("UNKNOWN_EMAIL_CACHE_SIZE", 10000))
+_unknown_emails = (
+    TTLCache(maxsize=UNKNOWN_EMAIL_CACHE_SIZE, ttl=UNKNOWN_EMAIL_CACHE_TTL)
+    if UNKNOWN_EMAIL_CACHE_TTL > 0 else None
+)
+_unknown_emails_lock = Lock()
+# Bumped on every registration so a login that read "missing" before a
+# concurrent create() doesn't cache the miss after register has cleared it
+_registration_generation = 0
+
+MAX_DOCUMENT_ID_BYTES = 1500
+
+
+def _is_valid_user_id(email: str) -> bool:
+    # Users are keyed by email, so it must also be a valid Firestore document ID
+    if not email or "/" in email or email in (".", ".."):
+        return False
+    if email.startswith("__") and email.endswith("__"):
+        return False
+    return len(email.encode()) <= MAX_DOCUMENT_ID_BYTES
+
+
+def _is_valid_login_email(email: str) -> bool:
+    if not _is_valid_user_id(email):
+        return False
+    try:
+        validate_email(email, check_deliverability=False)
+    except EmailNotValidError:
+        return False
+    return True
+
+
+def _is_cached_unknown(email: str) -> bool:
+    if _unknown_emails is None:
+        return False
+    with _unknown_emails_lock:
+        return email in _unknown_emails
+
+
+def _cache_unknown(email: str, generation: int):
+    if _unknown_emails is None:
+        return
+    with _unknown_emails_lock:
+        if generation == _registration_generation:
+            _unknown_emails[email] = True
+
+
+def _forget_unknown(email: str):
+    global _registration_generation
+    with _unknown_emails_lock:
+        _registration_generation += 1
+        if _unknown_emails is not None:
+            _unknown_emails.pop(email, None)
+
+
 # ✅ Register
 @router.post("/register")
 def register_user(user: User):
-    users_ref = db.collection("users").where(filter=FieldFilter("email", "==", user.email)).stream()
-    for doc in users_ref:
-        raise HTTPException(status_code=400, detail="User already exists")
+    if not _is_valid_user_id(user.email):
+        raise HTTPException(status_code=400, detail="Invalid email")
 
     user_id = str(uuid4())
     hashed_password = hash_password(user.password)
@@ -27,7 +90,13 @@ def register_user(user: User):
         "selected_categories": [],
         "favourites": []
     }
-    db.collection("users").document(user.email).set(user_data)
+    # create() fails if the document already exists, so the check and write are atomic
+    try:
+        db.collection("users").document(user.email).create(user_data)
+    except AlreadyExists:
+        raise HTTPException(status_code=400, detail="User already exists")
+
+    _forget_unknown(user.email)
     return {"message": "User registered successfully", "user_id": user_id}
 
 
@@ -35,13 +104,23 @@ def register_user(user: User):
 @router.post("/login")
 def login_user(form_data: OAuth2PasswordRequestForm = Depends()):
     user_email = form_data.username
-    users_ref = db.collection("users").where(filter=FieldFilter("email", "==", user_email)).stream()
-    user_doc = None
-    for doc in users_ref:
-        user_doc = doc.to_dict()
-        break
+    # The username becomes a document ID, so reject anything Firestore can't address
+    if not _is_valid_login_email(user_email) or _is_cached_unknown(user_email):
+        raise HTTPException(status_code=400, detail="Invalid email or password")
+
+    generation = _registration_generation
+    # Users are keyed by email, so a point read replaces the collection query
+    try:
+        doc = db.collection("users").document(user_email).get()
+    except (ValueError, InvalidArgument):
+        raise HTTPException(status_code=400, detail="Invalid email or password")
+
+    if not doc.exists:
+        _cache_unknown(user_email, generation)
+        raise HTTPException(status_code=400, detail="Invalid email or password")
 
-    if not user_doc or not verify_password(form_data.password, user_doc["password"]):
+    user_doc = doc.to_dict()
+    if not verify_password(form_data.password, user_doc["password"]):
         raise HTTPException(status_code=400, detail="Invalid email or password")
 
     access_token = create_access_token(data={"sub": user_doc["email"]}, expires_delta=timedelta(days=7))
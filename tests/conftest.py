@@ -0,0 +1,19 @@
+import os
+import sys
+import types
+import pytest
+from benchmarks.fake_firestore import FakeClient
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+# database.py needs Firebase credentials at import time, so swap in the fake
+fake_db = FakeClient()
+sys.modules["database"] = types.SimpleNamespace(db=fake_db)
+
+
+@pytest.fixture
+def db():
+    fake_db.reset()
+    yield fake_db
+    fake_db.reset()
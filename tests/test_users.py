@@ -0,0 +1,114 @@
+import types
+import pytest
+from cachetools import TTLCache
+from fastapi import HTTPException
+from google.api_core.exceptions import InvalidArgument
+from schemas import User
+from auth import pwd_context
+from routes import users
+
+
+@pytest.fixture
+def unknown_cache(monkeypatch):
+    cache = TTLCache(maxsize=100, ttl=30)
+    monkeypatch.setattr(users, "_unknown_emails", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def fast_hashing(monkeypatch):
+    fast = pwd_context.copy(bcrypt__rounds=4)
+    monkeypatch.setattr(users, "hash_password", fast.hash)
+    monkeypatch.setattr(users, "verify_password", fast.verify)
+
+
+def register(email="jane@example.com", password="secret"):
+    return users.register_user(User(name="Jane", email=email, password=password))
+
+
+def login(email="jane@example.com", password="secret"):
+    return users.login_user(types.SimpleNamespace(username=email, password=password))
+
+
+def test_register_then_login(db):
+    register()
+    assert login()["token_type"] == "bearer"
+
+
+def test_register_existing_user_returns_400(db):
+    register()
+    with pytest.raises(HTTPException) as exc:
+        register()
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "User already exists"
+
+
+def test_login_wrong_password_returns_400(db):
+    register()
+    with pytest.raises(HTTPException) as exc:
+        login(password="wrong")
+    assert exc.value.status_code == 400
+
+
+def test_login_missing_user_caches_miss(db, unknown_cache):
+    with pytest.raises(HTTPException) as exc:
+        login()
+    assert exc.value.status_code == 400
+    assert "jane@example.com" in unknown_cache
+
+
+def test_cached_miss_skips_read(db, unknown_cache):
+    unknown_cache["jane@example.com"] = True
+    with pytest.raises(HTTPException):
+        login()
+    assert db.reads == 0
+
+
+def test_register_clears_cached_miss(db, unknown_cache):
+    with pytest.raises(HTTPException):
+        login()
+    register()
+    assert "jane@example.com" not in unknown_cache
+    assert login()["token_type"] == "bearer"
+
+
+def test_miss_read_before_concurrent_register_is_not_cached(db, unknown_cache, monkeypatch):
+    real_cache_unknown = users._cache_unknown
+
+    def register_during_read(email, generation):
+        register()
+        real_cache_unknown(email, generation)
+
+    monkeypatch.setattr(users, "_cache_unknown", register_during_read)
+    with pytest.raises(HTTPException):
+        login()
+    assert "jane@example.com" not in unknown_cache
+
+
+def test_cache_disabled_by_default(db):
+    assert users._unknown_emails is None
+    with pytest.raises(HTTPException):
+        login()
+    register()
+    assert login()["token_type"] == "bearer"
+
+
+@pytest.mark.parametrize("username", [
+    "", ".", "..", "__x__", "a/b@example.com", "not-an-email", "a" * 1500 + "@example.com",
+])
+def test_login_rejects_invalid_document_ids(db, username):
+    with pytest.raises(HTTPException) as exc:
+        login(email=username)
+    assert exc.value.status_code == 400
+    assert db.reads == 0
+
+
+@pytest.mark.parametrize("error", [ValueError("bad path"), InvalidArgument("bad path")])
+def test_login_read_errors_return_400(db, monkeypatch, error):
+    def fail(self):
+        raise error
+
+    monkeypatch.setattr("benchmarks.fake_firestore.FakeDocument.get", fail)
+    with pytest.raises(HTTPException) as exc:
+        login()
+    assert exc.value.status_code == 400